@@ -5,18 +5,41 @@ apkReforge - Automated APK Rebuild, Align, Sign & Install Tool
 """
 
 import argparse
+import asyncio
+import collections
+import concurrent.futures
 import subprocess
+import threading
 import sys
 import os
 import logging
+import mmap
+import select
 import shutil
 import tempfile
+import time
 import re
+import uuid
 from pathlib import Path
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
+
+try:
+    import fcntl
+    _FICLONE = 0x40049409  # linux/fs.h; reflink ioctl on CoW filesystems
+except ImportError:
+    fcntl = None
 
 __version__ = "1.1.2"
 
+# Compiled once at module load; binary pattern so the manifest never needs a
+# UTF-8 decode (apktool output can be binary AXML). One alternation pass
+# collects every attribute the tool ever consults
+_MANIFEST_ATTR_RE = re.compile(rb'(targetSdkVersion|minSdkVersion|package)\s*=\s*"([^"]+)"')
+
+# Serials in `adb devices` output; one C-level scan instead of per-line
+# Python string work (CI farms can report hundreds of devices)
+_DEVICE_RE = re.compile(rb'^(\S+)\tdevice\s*$', re.M)
+
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'
@@ -33,6 +56,20 @@ class APKReforge:
         self.setup_logging()
         self.temp_dir = None
         self.android_debug_keystore = self.get_android_debug_keystore_path()
+        # Resolve the debug keystore once; batch mode would otherwise stat
+        # the same path on every sign
+        self._resolved_keystore = (
+            self.android_debug_keystore
+            if os.path.exists(self.android_debug_keystore) else None
+        )
+        self._adb_sessions: Dict[str, subprocess.Popen] = {}
+        self._adb_session_locks: Dict[str, threading.Lock] = {}
+        self._adb_lock = threading.Lock()
+        self._tool_paths: Dict[str, str] = {}
+        self._deps: Optional[Dict[str, bool]] = None
+        self._manifest_cache: Dict[Tuple[str, float], Dict[str, str]] = {}
+        self._apktool_ver: Optional[Tuple[int, int]] = None
+        self._always_aapt2 = False
 
     def setup_logging(self):
         level = logging.DEBUG if self.verbose else logging.INFO
@@ -53,12 +90,41 @@ class APKReforge:
         return os.path.join(home, ".android", "debug.keystore")
 
     def check_dependencies(self) -> Dict[str, bool]:
-        # Check if required binaries are present and where they're located
+        # Check if required binaries are present and where they're located.
+        # A single PATH walk covers every tool, and the resolved paths are
+        # kept so later subprocess calls can use absolute executables
+        if self._deps is not None:
+            return self._deps
         tools = ['apktool', 'zipalign', 'apksigner', 'adb', 'keytool']
-        deps = {}
+        needed = frozenset(tools)
+        path_dirs = os.environ.get('PATH', os.defpath).split(os.pathsep)
+
+        def _scan(directory: str) -> Dict[str, str]:
+            found = {}
+            try:
+                with os.scandir(directory or '.') as entries:
+                    for entry in entries:
+                        # is_file() rejects directories, which are always
+                        # traversable and would otherwise shadow the binary
+                        if (entry.name in needed and entry.is_file()
+                                and os.access(entry.path, os.X_OK)):
+                            found[entry.name] = entry.path
+            except OSError:
+                pass
+            return found
+
+        # Each directory probe is independent I/O, so scan them concurrently;
+        # map preserves PATH order, and setdefault keeps first-hit-wins
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(path_dirs), 8) or 1
+        ) as pool:
+            for found in pool.map(_scan, path_dirs):
+                for name, path in found.items():
+                    self._tool_paths.setdefault(name, path)
 
+        deps = {}
         for tool in tools:
-            path = shutil.which(tool)
+            path = self._tool_paths.get(tool)
             if path:
                 deps[tool] = True
                 if self.verbose:
@@ -69,8 +135,30 @@ class APKReforge:
                 deps[tool] = False
                 self.logger.error(f"{Colors.RED}Missing tool: {tool}{Colors.RESET}")
 
+        if deps.get('apktool') and self._apktool_ver is None:
+            self._probe_apktool_version()
+        self._deps = deps
         return deps
 
+    def _probe_apktool_version(self):
+        try:
+            result = subprocess.run(
+                [self._tool_paths['apktool'], '--version'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                timeout=15,
+                close_fds=False
+            )
+            match = re.match(rb'(\d+)\.(\d+)', result.stdout.strip())
+            if match:
+                self._apktool_ver = (int(match.group(1)), int(match.group(2)))
+                # apktool >= 2.5 builds with aapt2 by default, so probing the
+                # manifest to decide on --use-aapt2 is pointless there
+                self._always_aapt2 = self._apktool_ver >= (2, 5)
+                self.logger.debug(f"apktool version: {self._apktool_ver[0]}.{self._apktool_ver[1]}")
+        except Exception as e:
+            self.logger.debug(f"Could not probe apktool version: {str(e)}")
+
     def _check_zipalign_fallback(self) -> bool:
         try:
             result = subprocess.run(
@@ -85,32 +173,95 @@ class APKReforge:
             return False
 
     def run_command(self, cmd: List[str], error_msg: str = "Command failed") -> bool:
+        if cmd and cmd[0] in self._tool_paths:
+            cmd = [self._tool_paths[cmd[0]], *cmd[1:]]
         self.logger.debug(f"$ {' '.join(cmd)}")
         try:
-            result = subprocess.run(
+            # In quiet mode stdout never even reaches userspace.
+            # close_fds=False keeps us on CPython's posix_spawn fast path
+            # (no page-table fork of the interpreter); safe since PEP 446
+            # makes descriptors non-inheritable by default
+            proc = subprocess.Popen(
                 cmd,
-                stdout=subprocess.PIPE,
+                stdout=subprocess.PIPE if self.verbose else subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
-                text=True,
-                timeout=120
+                close_fds=False
             )
-            if self.verbose:
-                if result.stdout:
-                    self.logger.debug(f"STDOUT:\n{result.stdout}")
-                if result.stderr:
-                    self.logger.debug(f"STDERR:\n{result.stderr}")
-
-            if result.returncode != 0:
-                self.logger.error(f"{Colors.RED}{error_msg} (code {result.returncode}){Colors.RESET}")
-                if result.stderr:
-                    self.logger.error(result.stderr.strip())
+            # Drain the pipes line by line while the tool runs: verbose mode
+            # shows long apktool phases as they happen, and memory stays
+            # bounded to a short stderr tail instead of the full output
+            stderr_tail = collections.deque(maxlen=40)
+
+            def _drain(stream, log, tail=None):
+                with stream:
+                    for raw in stream:
+                        line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+                        if tail is not None:
+                            tail.append(line)
+                        if log is not None:
+                            log(line)
+
+            threads = []
+            if proc.stdout is not None:
+                threads.append(threading.Thread(
+                    target=_drain, args=(proc.stdout, self.logger.debug), daemon=True))
+            threads.append(threading.Thread(
+                target=_drain,
+                args=(proc.stderr, self.logger.debug if self.verbose else None, stderr_tail),
+                daemon=True))
+            for thread in threads:
+                thread.start()
+            try:
+                proc.wait(timeout=120)
+            except subprocess.TimeoutExpired as te:
+                proc.kill()
+                proc.wait()
+                self.logger.error(f"{Colors.RED}Timeout exceeded: {te}{Colors.RESET}")
+                return False
+            for thread in threads:
+                thread.join(timeout=5)
+
+            if proc.returncode != 0:
+                self.logger.error(f"{Colors.RED}{error_msg} (code {proc.returncode}){Colors.RESET}")
+                if stderr_tail:
+                    self.logger.error('\n'.join(stderr_tail).strip())
                 return False
 
             return True
 
-        except subprocess.TimeoutExpired as te:
-            self.logger.error(f"{Colors.RED}Timeout exceeded: {te}{Colors.RESET}")
+        except Exception as e:
+            self.logger.error(f"{Colors.RED}Unexpected error: {str(e)}{Colors.RESET}")
             return False
+
+    async def _run_async(self, cmd: List[str], error_msg: str = "Command failed") -> bool:
+        # Async twin of run_command for the batch pipeline
+        if cmd and cmd[0] in self._tool_paths:
+            cmd = [self._tool_paths[cmd[0]], *cmd[1:]]
+        self.logger.debug(f"$ {' '.join(cmd)}")
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=120)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.communicate()
+                self.logger.error(f"{Colors.RED}Timeout exceeded: {' '.join(cmd)}{Colors.RESET}")
+                return False
+            if self.verbose:
+                if stdout:
+                    self.logger.debug(f"STDOUT:\n{stdout.decode('utf-8', 'replace')}")
+                if stderr:
+                    self.logger.debug(f"STDERR:\n{stderr.decode('utf-8', 'replace')}")
+            if proc.returncode != 0:
+                self.logger.error(f"{Colors.RED}{error_msg} (code {proc.returncode}){Colors.RESET}")
+                if stderr:
+                    self.logger.error(stderr.decode('utf-8', 'replace').strip())
+                return False
+            return True
         except Exception as e:
             self.logger.error(f"{Colors.RED}Unexpected error: {str(e)}{Colors.RESET}")
             return False
@@ -120,13 +271,9 @@ class APKReforge:
         if not os.path.exists(os.path.join(input_dir, "AndroidManifest.xml")):
             self.logger.error(f"{Colors.RED}Directory does not contain AndroidManifest.xml{Colors.RESET}")
             return False
-        cmd = [
-            'apktool', 'b', 
-            '-o', output_apk,
-            '--use-aapt2' if self.detect_high_sdk(input_dir) else '',
-            input_dir
-        ]
-        cmd = [c for c in cmd if c]
+        cmd = ['apktool', 'b', '-o', output_apk, input_dir]
+        if self.detect_high_sdk(input_dir):
+            cmd.insert(4, '--use-aapt2')
         if not self.run_command(cmd, "Error in apktool"):
             self.logger.warning(f"{Colors.YELLOW}Trying without AAPT2...{Colors.RESET}")
             cmd_fallback = ['apktool', 'b', input_dir, '-o', output_apk]
@@ -170,11 +317,66 @@ class APKReforge:
             return True
         return False
 
+    def sign_apks(self, pairs: List[Tuple[str, str]], keystore_path: Optional[str] = None) -> bool:
+        # apksigner accepts only one APK per invocation, so a single batched
+        # argv is not possible; run the per-APK invocations concurrently
+        # instead so the JVM cold-starts overlap rather than add up
+        if len(pairs) == 1:
+            input_apk, output_apk = pairs[0]
+            return self.sign_apk(input_apk, output_apk, keystore_path)
+        keystore_path = keystore_path or self.get_keystore()
+        if not keystore_path:
+            return False
+        self.logger.info(f"{Colors.CYAN}Signing {len(pairs)} APKs with {os.path.basename(keystore_path)}...{Colors.RESET}")
+
+        def _sign(pair: Tuple[str, str]) -> bool:
+            input_apk, output_apk = pair
+            cmd = [
+                'apksigner', 'sign',
+                '--ks', keystore_path,
+                '--ks-pass', 'pass:android',
+                '--ks-key-alias', 'androiddebugkey',
+                '--key-pass', 'pass:android',
+                '--out', output_apk,
+                input_apk
+            ]
+            return self.run_command(cmd, f"Error in signature ({os.path.basename(input_apk)})")
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(pairs), os.cpu_count() or 1)
+        ) as pool:
+            results = list(pool.map(_sign, pairs))
+        if not all(results):
+            return False
+        return self.verify_apks([output_apk for _, output_apk in pairs])
+
+    def verify_apks(self, apk_paths: List[str]) -> bool:
+        # Verification is embarrassingly parallel: each apksigner verify is
+        # an independent process the worker threads merely wait on
+        if len(apk_paths) == 1:
+            return self.run_command(['apksigner', 'verify', apk_paths[0]],
+                                    "Failed signature verification")
+        self.logger.info(f"{Colors.CYAN}Verifying {len(apk_paths)} signatures...{Colors.RESET}")
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=min(len(apk_paths), os.cpu_count() or 1)
+        ) as pool:
+            results = list(pool.map(
+                lambda p: self.run_command(
+                    ['apksigner', 'verify', p],
+                    f"Failed signature verification ({os.path.basename(p)})"
+                ),
+                apk_paths
+            ))
+        return all(results)
+
     def get_keystore(self) -> Optional[str]:
-        if os.path.exists(self.android_debug_keystore):
-            return self.android_debug_keystore
-        self.logger.info(f"{Colors.YELLOW}Creating temporary keystore...{Colors.RESET}")
+        if self._resolved_keystore:
+            return self._resolved_keystore
         keystore_path = os.path.join(tempfile.gettempdir(), 'apkreforge.keystore')
+        if os.path.exists(keystore_path):
+            self._resolved_keystore = keystore_path
+            return keystore_path
+        self.logger.info(f"{Colors.YELLOW}Creating temporary keystore...{Colors.RESET}")
         cmd = [
             'keytool', '-genkey', '-v',
             '-keystore', keystore_path,
@@ -187,46 +389,230 @@ class APKReforge:
             '-dname', 'CN=Android Debug,O=Android,C=US'
         ]
         if self.run_command(cmd, "Error creating keystore"):
+            self._resolved_keystore = keystore_path
             return keystore_path
         self.logger.error(f"{Colors.RED}Could not create keystore{Colors.RESET}")
         return None
 
+    def _parse_manifest(self, manifest_path: str) -> Dict[str, str]:
+        # Attributes are cached per (path, mtime) so the AAPT2-fallback
+        # retry and batch reuse never rescan an unchanged manifest.
+        # mmap lets the kernel page in only what the regex actually touches
+        mtime = os.path.getmtime(manifest_path)
+        key = (manifest_path, mtime)
+        cached = self._manifest_cache.get(key)
+        if cached is not None:
+            return cached
+        attrs: Dict[str, str] = {}
+        with open(manifest_path, 'rb') as f:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    matches = _MANIFEST_ATTR_RE.finditer(mm)
+                    for match in matches:
+                        attrs.setdefault(match.group(1).decode(),
+                                         match.group(2).decode('utf-8', 'replace'))
+            except (ValueError, OSError):
+                for match in _MANIFEST_ATTR_RE.finditer(f.read()):
+                    attrs.setdefault(match.group(1).decode(),
+                                     match.group(2).decode('utf-8', 'replace'))
+        self._manifest_cache[key] = attrs
+        return attrs
+
     def detect_high_sdk(self, input_dir: str) -> bool:
+        if self._always_aapt2:
+            return True
         manifest = os.path.join(input_dir, 'AndroidManifest.xml')
-        if not os.path.exists(manifest):
-            return False
         try:
-            with open(manifest, 'r') as f:
-                content = f.read()
-            match = re.search(r'targetSdkVersion\s*=\s*"(\d+)"', content)
-            if match:
-                return int(match.group(1)) >= 34
+            target_sdk = self._parse_manifest(manifest).get('targetSdkVersion')
+            return target_sdk is not None and int(target_sdk) >= 34
         except Exception:
-            pass
-        return False
+            return False
+
+    def _adb_shell(self, device: str, command: str) -> Optional[str]:
+        # Reuse one long-lived `adb shell` per device instead of paying the
+        # adb connection setup cost for every shell-side query. Batch mode
+        # reaches this from several threads, so session creation and the
+        # whole write/read round-trip are serialized per device — otherwise
+        # one thread could consume another's sentinel and block forever
+        with self._adb_lock:
+            device_lock = self._adb_session_locks.setdefault(device, threading.Lock())
+        with device_lock:
+            session = self._adb_sessions.get(device)
+            if session is None or session.poll() is not None:
+                try:
+                    # stderr goes to DEVNULL: nothing drains it, and a chatty
+                    # shell would eventually fill the pipe and wedge the session
+                    session = subprocess.Popen(
+                        [self._tool_paths.get('adb', 'adb'), '-s', device, 'shell'],
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.DEVNULL,
+                        text=True,
+                        bufsize=1,
+                        close_fds=False
+                    )
+                except Exception as e:
+                    self.logger.debug(f"Could not open shell session on {device}: {str(e)}")
+                    return None
+                self._adb_sessions[device] = session
+            try:
+                # The sentinel rides on its own line so command output without
+                # a trailing newline can't glue itself to it and hide it
+                session.stdin.write(f"{command}; printf '\\n__END__%s\\n' $?\n")
+                session.stdin.flush()
+                # Read the raw descriptor under a select deadline: a wedged or
+                # disconnected device must not block the thread forever, and
+                # every other adb interaction here is bounded at 120s
+                fd = session.stdout.fileno()
+                buf = b''
+                deadline = time.monotonic() + 120
+                while True:
+                    marker = buf.find(b'\n__END__')
+                    if marker != -1:
+                        end = buf.find(b'\n', marker + 1)
+                        if end != -1:
+                            if buf[marker + 8:end].strip() != b'0':
+                                self.logger.debug(f"Shell command failed on {device}: {command}")
+                                return None
+                            lines = buf[:marker].decode('utf-8', 'replace').splitlines()
+                            while lines and lines[-1] == '':
+                                lines.pop()
+                            return '\n'.join(lines)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                        self.logger.debug(f"Shell session timeout on {device}: {command}")
+                        session.kill()
+                        self._adb_sessions.pop(device, None)
+                        return None
+                    chunk = os.read(fd, 4096)
+                    if not chunk:
+                        self.logger.debug(f"Shell session closed on {device}")
+                        self._adb_sessions.pop(device, None)
+                        return None
+                    buf += chunk
+            except Exception as e:
+                self.logger.debug(f"Shell session error on {device}: {str(e)}")
+            return None
 
-    def install_apk(self, apk_path: str) -> bool:
+    def _install_via_push(self, device: str, apk_path: str) -> bool:
+        # Workaround for adbd versions where `adb install` streams slowly:
+        # push to /data/local/tmp, install locally with pm, then clean up
+        self.logger.info(f"{Colors.CYAN}Installing in {device} (push + pm install)...{Colors.RESET}")
+        # Unique remote name: concurrent pipelines in batch mode push
+        # different APKs to the same device and must not overwrite each other
+        remote_apk = f'/data/local/tmp/apkreforge-{os.getpid()}-{uuid.uuid4().hex}.apk'
+        if not self.run_command(
+            ['adb', '-s', device, 'push', apk_path, remote_apk],
+            f"Error pushing APK to {device}"
+        ):
+            return False
+        installed = self.run_command(
+            ['adb', '-s', device, 'shell', 'pm', 'install', '-r', remote_apk],
+            f"Error installing in {device}"
+        )
+        self.run_command(
+            ['adb', '-s', device, 'shell', 'rm', '-f', remote_apk],
+            f"Error removing temporary APK from {device}"
+        )
+        return installed
+
+    def install_apk(self, apk_path: str, serial: bool = False) -> bool:
         self.logger.info(f"\n{Colors.BOLD}{Colors.BLUE}[+] PHASE 4: Installing APK{Colors.RESET}")
         self.logger.info(f"{Colors.CYAN}Searching for devices...{Colors.RESET}")
-        devices = subprocess.run(
-            ['adb', 'devices'],
-            stdout=subprocess.PIPE,
-            text=True
-        ).stdout.splitlines()
-        active_devices = [d.split('\t')[0] for d in devices[1:] if '\tdevice' in d]
+        proc = subprocess.run(['adb', 'devices'], stdout=subprocess.PIPE)
+        active_devices = [m.group(1).decode() for m in _DEVICE_RE.finditer(proc.stdout)]
         if not active_devices:
             self.logger.error(f"{Colors.RED}No connected devices found{Colors.RESET}")
             return False
         self.logger.info(f"{Colors.GREEN}Devices detected: {', '.join(active_devices)}{Colors.RESET}")
-        success = True
+        if self.verbose:
+            for device in active_devices:
+                abi = self._adb_shell(device, 'getprop ro.product.cpu.abi')
+                free = self._adb_shell(device, 'df /data | tail -n 1')
+                if abi:
+                    self.logger.debug(f"{device}: abi={abi}")
+                if free:
+                    self.logger.debug(f"{device}: df /data: {free}")
+        if os.environ.get('APKREFORGE_MANUAL_INSTALL') == '1':
+            if serial:
+                return all([self._install_via_push(d, apk_path) for d in active_devices])
+            # Each push/install pipeline is I/O-bound on its own device
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(active_devices)) as pool:
+                results = pool.map(lambda d: self._install_via_push(d, apk_path), active_devices)
+                return all(list(results))
+        if serial or len(active_devices) == 1:
+            success = True
+            for device in active_devices:
+                self.logger.info(f"{Colors.CYAN}Installing in {device}...{Colors.RESET}")
+                cmd = ['adb', '-s', device, 'install', '-r', apk_path]
+                if not self.run_command(cmd, f"Error installing in {device}"):
+                    success = False
+            return success
+        # Each install is independent I/O on a distinct device, so launch one
+        # adb per device and collect results afterwards
+        procs = []
         for device in active_devices:
             self.logger.info(f"{Colors.CYAN}Installing in {device}...{Colors.RESET}")
-            cmd = ['adb', '-s', device, 'install', '-r', apk_path]
-            if not self.run_command(cmd, f"Error installing in {device}"):
+            procs.append((device, subprocess.Popen(
+                [self._tool_paths.get('adb', 'adb'), '-s', device, 'install', '-r', apk_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                close_fds=False
+            )))
+        success = True
+        for device, proc in procs:
+            try:
+                stdout, stderr = proc.communicate(timeout=120)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                self.logger.error(f"{Colors.RED}Timeout installing in {device}{Colors.RESET}")
+                success = False
+                continue
+            if proc.returncode != 0:
+                self.logger.error(f"{Colors.RED}Error installing in {device} (code {proc.returncode}){Colors.RESET}")
+                if stderr:
+                    self.logger.error(stderr.strip())
                 success = False
+            else:
+                self.logger.info(f"{Colors.GREEN}Installed in {device}{Colors.RESET}")
         return success
 
+    def _clone_file(self, src: str, dst: str):
+        # Hand a finished file to its destination without rewriting its
+        # bytes where the filesystem allows it: hardlink on the same fs,
+        # FICLONE reflink on CoW filesystems, full copy as last resort
+        tmp = f"{dst}.tmp"
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        cloned = False
+        try:
+            os.link(src, tmp)
+            cloned = True
+        except OSError:
+            pass
+        if not cloned and fcntl is not None:
+            try:
+                with open(src, 'rb') as fsrc, open(tmp, 'wb') as fdst:
+                    fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                cloned = True
+            except OSError:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+        if not cloned:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+
     def cleanup(self):
+        for device, session in self._adb_sessions.items():
+            try:
+                session.stdin.close()
+                session.terminate()
+                session.wait(timeout=5)
+            except Exception as e:
+                self.logger.debug(f"Error closing shell session on {device}: {str(e)}")
+        self._adb_sessions.clear()
         if self.temp_dir and os.path.exists(self.temp_dir):
             try:
                 shutil.rmtree(self.temp_dir)
@@ -234,12 +620,15 @@ class APKReforge:
             except Exception as e:
                 self.logger.error(f"Error clearing temporary: {str(e)}")
 
-    def process_apk(self, input_dir: str, output_apk: str, install: bool = False, 
-                   keystore: Optional[str] = None) -> bool:
+    def print_banner(self):
         print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*50}{Colors.RESET}")
         print(f"{Colors.BOLD}{Colors.RED}Lautaro Villarreal Culic' - https://lautarovculic.com{Colors.RESET}")
         print(f"{Colors.BOLD}{Colors.RED}RUNNING apkReforge v{__version__}{Colors.RESET}")
         print(f"\n{Colors.BOLD}{Colors.HEADER}{'='*50}{Colors.RESET}")
+
+    def process_apk(self, input_dir: str, output_apk: str, install: bool = False,
+                   keystore: Optional[str] = None, install_serial: bool = False) -> bool:
+        self.print_banner()
         self.logger.info(f"{Colors.BOLD}{Colors.CYAN}> INPUT: {input_dir}{Colors.RESET}")
         self.logger.info(f"{Colors.BOLD}{Colors.CYAN}< OUTPUT: {output_apk}{Colors.RESET}")
         deps = self.check_dependencies()
@@ -251,16 +640,20 @@ class APKReforge:
         try:
             rebuilt_apk = os.path.join(self.temp_dir, 'unsigned.apk')
             aligned_apk = os.path.join(self.temp_dir, 'aligned.apk')
+            signed_apk = os.path.join(self.temp_dir, 'signed.apk')
             steps = [
                 (f"Failed rebuild", lambda: self.rebuild_apk(input_dir, rebuilt_apk)),
                 (f"Failed alignment", lambda: self.align_apk(rebuilt_apk, aligned_apk)),
-                (f"Failed signature", lambda: self.sign_apk(aligned_apk, output_apk, keystore)),
+                (f"Failed signature", lambda: self.sign_apk(aligned_apk, signed_apk, keystore)),
             ]
             for error_msg, step in steps:
                 if not step():
                     self.logger.error(f"{Colors.RED}{error_msg}{Colors.RESET}")
                     return False
-            if install and not self.install_apk(output_apk):
+            # Sign into the temp dir and clone to the destination, so a
+            # failed run never leaves a partial file at the output path
+            self._clone_file(signed_apk, output_apk)
+            if install and not self.install_apk(output_apk, serial=install_serial):
                 self.logger.warning(f"{Colors.YELLOW}Installation failed, but APK generated{Colors.RESET}")
             self.logger.info(f"\n{Colors.GREEN}[+] PROCESS SUCCESSFULLY COMPLETED!{Colors.RESET}")
             self.logger.info(f"{Colors.GREEN}Final APK: {os.path.abspath(output_apk)}{Colors.RESET}")
@@ -271,6 +664,124 @@ class APKReforge:
         finally:
             self.cleanup()
 
+    async def _process_one_async(self, input_dir: str, output_apk: str,
+                                 sem: asyncio.Semaphore, keystore: str,
+                                 install: bool = False,
+                                 install_serial: bool = False) -> bool:
+        name = os.path.basename(os.path.normpath(input_dir))
+        if not await asyncio.to_thread(
+            os.path.exists, os.path.join(input_dir, "AndroidManifest.xml")
+        ):
+            self.logger.error(f"{Colors.RED}{name}: directory does not contain AndroidManifest.xml{Colors.RESET}")
+            return False
+        # Disk-side setup runs in worker threads so it overlaps with tool
+        # processes of the other APKs instead of stalling the event loop
+        use_aapt2 = await asyncio.to_thread(self.detect_high_sdk, input_dir)
+        temp_dir = await asyncio.to_thread(tempfile.mkdtemp, prefix='apkreforge_')
+        try:
+            rebuilt_apk = os.path.join(temp_dir, 'unsigned.apk')
+            aligned_apk = os.path.join(temp_dir, 'aligned.apk')
+            signed_apk = os.path.join(temp_dir, 'signed.apk')
+            # The semaphore is held per tool run, so apktool of one APK
+            # overlaps zipalign/apksigner of another
+            cmd = ['apktool', 'b', '-o', rebuilt_apk, input_dir]
+            if use_aapt2:
+                cmd.insert(4, '--use-aapt2')
+            async with sem:
+                self.logger.info(f"{Colors.CYAN}[{name}] Rebuilding...{Colors.RESET}")
+                ok = await self._run_async(cmd, f"Error in apktool ({name})")
+                if not ok:
+                    self.logger.warning(f"{Colors.YELLOW}[{name}] Trying without AAPT2...{Colors.RESET}")
+                    ok = await self._run_async(
+                        ['apktool', 'b', input_dir, '-o', rebuilt_apk],
+                        f"Error in rebuild ({name})"
+                    )
+            if not ok:
+                return False
+            async with sem:
+                self.logger.info(f"{Colors.CYAN}[{name}] Aligning...{Colors.RESET}")
+                if not await self._run_async(
+                    ['zipalign', '-v', '4', rebuilt_apk, aligned_apk],
+                    f"Error in zipalign ({name})"
+                ):
+                    return False
+            async with sem:
+                self.logger.info(f"{Colors.CYAN}[{name}] Signing...{Colors.RESET}")
+                cmd = [
+                    'apksigner', 'sign',
+                    '--ks', keystore,
+                    '--ks-pass', 'pass:android',
+                    '--ks-key-alias', 'androiddebugkey',
+                    '--key-pass', 'pass:android',
+                    '--out', signed_apk,
+                    aligned_apk
+                ]
+                if not await self._run_async(cmd, f"Error in signature ({name})"):
+                    return False
+                if not await self._run_async(
+                    ['apksigner', 'verify', signed_apk],
+                    f"Failed signature verification ({name})"
+                ):
+                    return False
+            self._clone_file(signed_apk, output_apk)
+            if install and not await asyncio.to_thread(
+                self.install_apk, output_apk, install_serial
+            ):
+                self.logger.warning(f"{Colors.YELLOW}[{name}] Installation failed, but APK generated{Colors.RESET}")
+            self.logger.info(f"{Colors.GREEN}[{name}] Final APK: {os.path.abspath(output_apk)}{Colors.RESET}")
+            return True
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def process_many(self, input_dirs: List[str], output_dir: str, install: bool = False,
+                     keystore: Optional[str] = None, install_serial: bool = False) -> bool:
+        # Batch mode: flow several APKs through rebuild/align/sign
+        # concurrently so CPU-bound apktool work overlaps I/O-bound phases
+        self.print_banner()
+        self.logger.info(f"{Colors.BOLD}{Colors.CYAN}> INPUTS: {', '.join(input_dirs)}{Colors.RESET}")
+        self.logger.info(f"{Colors.BOLD}{Colors.CYAN}< OUTPUT DIR: {output_dir}{Colors.RESET}")
+        # Output names come from the input directory basenames; duplicates
+        # would race onto the same destination and silently overwrite
+        names = [os.path.basename(os.path.normpath(d)) for d in input_dirs]
+        if duplicates := sorted({n for n in names if names.count(n) > 1}):
+            self.logger.error(f"{Colors.RED}Duplicate input directory names: {', '.join(duplicates)} "
+                              f"(outputs would overwrite each other; rename the directories){Colors.RESET}")
+            return False
+        deps = self.check_dependencies()
+        if missing := [t for t, v in deps.items() if not v]:
+            self.logger.error(f"{Colors.RED}[!!!] Missing dependencies: {', '.join(missing)}{Colors.RESET}")
+            return False
+        keystore_path = keystore or self.get_keystore()
+        if not keystore_path:
+            return False
+        os.makedirs(output_dir, exist_ok=True)
+
+        async def _run_all() -> List[bool]:
+            sem = asyncio.Semaphore(os.cpu_count() or 1)
+            tasks = [
+                self._process_one_async(
+                    input_dir,
+                    os.path.join(output_dir, f"{os.path.basename(os.path.normpath(input_dir))}.apk"),
+                    sem, keystore_path, install, install_serial
+                )
+                for input_dir in input_dirs
+            ]
+            return await asyncio.gather(*tasks)
+
+        try:
+            results = asyncio.run(_run_all())
+        except Exception as e:
+            self.logger.exception(f"{Colors.RED}CRITICAL ERROR: {str(e)}{Colors.RESET}")
+            return False
+        finally:
+            self.cleanup()
+        if all(results):
+            self.logger.info(f"\n{Colors.GREEN}[+] PROCESS SUCCESSFULLY COMPLETED!{Colors.RESET}")
+            return True
+        failed = sum(1 for r in results if not r)
+        self.logger.error(f"{Colors.RED}{failed} of {len(results)} APKs failed{Colors.RESET}")
+        return False
+
 def main():
     parser = argparse.ArgumentParser(
         description='apkReforge - Automation for rebuild, align, sign and install of APKs',
@@ -279,26 +790,42 @@ def main():
   apkReforge.py -i ./my_app/ -o final_app.apk
   apkReforge.py -i ./my_app/ -o final_app.apk --install -v
   apkReforge.py -i ./my_app/ -o final_app.apk --keystore my_keystore.jks
+  apkReforge.py -i ./app_one/ ./app_two/ -o ./out/
         """
     )
-    parser.add_argument('-i', '--input', required=True, help='Directory with decompiled APK')
-    parser.add_argument('-o', '--output', required=True, help='Final APK path')
+    parser.add_argument('-i', '--input', required=True, nargs='+',
+                        help='Directory with decompiled APK (several directories enable batch mode)')
+    parser.add_argument('-o', '--output', required=True,
+                        help='Final APK path (output directory in batch mode)')
     parser.add_argument('--install', action='store_true', help='Install on device after building')
+    parser.add_argument('--install-serial', action='store_true',
+                        help='Install on devices one at a time instead of in parallel')
     parser.add_argument('--keystore', help='Custom keystore (default: debug.keystore)')
     parser.add_argument('-v', '--verbose', action='store_true', help='Detailed mode (debug)')
     parser.add_argument('--version', action='version', version=f'apkReforge {__version__}')
     args = parser.parse_args()
-    if not os.path.isdir(args.input):
-        print(f"{Colors.RED}ERROR: Directory not found: {args.input}{Colors.RESET}")
-        return 1
+    for input_dir in args.input:
+        if not os.path.isdir(input_dir):
+            print(f"{Colors.RED}ERROR: Directory not found: {input_dir}{Colors.RESET}")
+            return 1
+    reforger = APKReforge(verbose=args.verbose)
+    if len(args.input) > 1:
+        success = reforger.process_many(
+            input_dirs=[os.path.abspath(d) for d in args.input],
+            output_dir=os.path.abspath(args.output),
+            install=args.install,
+            keystore=args.keystore,
+            install_serial=args.install_serial
+        )
+        return 0 if success else 1
     output_dir = os.path.dirname(args.output) or '.'
     os.makedirs(output_dir, exist_ok=True)
-    reforger = APKReforge(verbose=args.verbose)
     success = reforger.process_apk(
-        input_dir=os.path.abspath(args.input),
+        input_dir=os.path.abspath(args.input[0]),
         output_apk=os.path.abspath(args.output),
         install=args.install,
-        keystore=args.keystore
+        keystore=args.keystore,
+        install_serial=args.install_serial
     )
     return 0 if success else 1
 